@@ -13,22 +13,7 @@
 
 import typing
 
-Coord = typing.Dict[str, int]
-GameState = typing.Dict[str, typing.Any]
-
-DIRECTIONS = {
-    "up": (0, 1),
-    "down": (0, -1),
-    "left": (-1, 0),
-    "right": (1, 0),
-}
-
-def in_bounds(pt: Coord, width: int, height: int) -> bool:
-    return 0 <= pt["x"] < width and 0 <= pt["y"] < height
-
-def step(head: Coord, dir_name: str) -> Coord:
-    dx, dy = DIRECTIONS[dir_name]
-    return {"x": head["x"] + dx, "y": head["y"] + dy}
+from examples.engine import DIRECTIONS, NECK_BLOCK, Coord, GameState
 
 def info() -> typing.Dict:
     print("INFO (Circle Snake)")
@@ -54,14 +39,12 @@ def move(game_state: GameState) -> typing.Dict:
     head: Coord = you["head"]
     body: typing.List[Coord] = you["body"]
 
-    # Avoid reversing into our neck (Battlesnake basic safety)
-    illegal: typing.Set[str] = set()
+    # Avoid reversing into our neck (Battlesnake basic safety). At most one
+    # move is ever illegal, so a plain string compare suffices.
+    reverse = None
     if len(body) >= 2:
         neck = body[1]
-        if neck["x"] < head["x"]: illegal.add("left")
-        if neck["x"] > head["x"]: illegal.add("right")
-        if neck["y"] < head["y"]: illegal.add("down")
-        if neck["y"] > head["y"]: illegal.add("up")
+        reverse = NECK_BLOCK.get((neck["x"] - head["x"], neck["y"] - head["y"]))
 
     x, y = head["x"], head["y"]
     top, bottom, left, right = height - 1, 0, 0, width - 1
@@ -99,10 +82,10 @@ def move(game_state: GameState) -> typing.Dict:
 
     # Pick the first preferred direction that is not reversing into neck and stays in-bounds.
     for mv in preferred:
-        if mv in illegal:
+        if mv == reverse:
             continue
-        nxt = step(head, mv)
-        if in_bounds(nxt, width, height):
+        dx, dy = DIRECTIONS[mv]
+        if 0 <= x + dx < width and 0 <= y + dy < height:
             print(f"MOVE {game_state['turn']}: {mv}")
             return {"move": mv}
 
@@ -0,0 +1,204 @@
+# Welcome to
+# __________         __    __  .__                               __
+# \______   \_____ _/  |__/  |_|  |   ____   ______ ____ _____  |  | __ ____
+#  |    |  _/\__  \\   __\   __\  | _/ __ \ /  ___//    \\__  \ |  |/ // __ \
+#  |    |   \ / __ \|  |  |  | |  |_\  ___/ \___ \|   |  \/ __ \|    <\  ___/
+#  |________/(______/__|  |__| |____/\_____>______>___|__(______/__|__\\_____>
+#
+# Shared engine for the example bots
+# - Board representation, BFS kernels and per-turn precomputation used by
+#   circle/dodge/hungry (and the negamax search), kept in one module so the
+#   pooled buffers and any future tuning are shared instead of copied.
+# - Cells are encoded as a single int `y * width + x` so the hot loops hash
+#   native ints instead of allocating a dict (or tuple) per visited cell.
+
+import threading
+import typing
+from collections import deque
+
+Coord = typing.Dict[str, int]
+GameState = typing.Dict[str, typing.Any]
+
+DIRECTIONS: typing.Dict[str, typing.Tuple[int, int]] = {
+    "up": (0, 1),
+    "down": (0, -1),
+    "left": (-1, 0),
+    "right": (1, 0),
+}
+
+# (neck_dx, neck_dy) relative to the head -> the move that would reverse into it
+NECK_BLOCK = {(-1, 0): "left", (1, 0): "right", (0, -1): "down", (0, 1): "up"}
+
+# Plain tuple of the four deltas for hot loops: iterating a module-level tuple
+# is cheaper than rebuilding a dict_values view from DIRECTIONS each pass.
+_DXY = ((0, 1), (0, -1), (-1, 0), (1, 0))
+
+# Cell-class bits in the occupancy grid: one bytearray answers every
+# "what is on this cell" question with a single masked byte load.
+BODY = 1      # any snake body cell
+OPP_NEXT = 2  # a cell an opponent's head could enter next turn
+FOOD = 4
+MY_BODY = 8   # our own body (these cells also carry BODY)
+
+# Reusable scratch buffers for the BFS kernels: allocated once per thread and
+# cleared per call, so a turn's searches cost no fresh deque/bytearray.
+# Thread-local because Flask serves concurrent /move requests on separate
+# threads, and two games racing on one shared queue/visited map would corrupt
+# each other's searches. Sized for boards up to 32x32; anything larger falls
+# back to a fresh buffer.
+class _Scratch(threading.local):
+    def __init__(self):
+        self.q: typing.Deque[int] = deque()
+        self.seen = bytearray(32 * 32)
+
+
+_SCRATCH = _Scratch()
+_ZERO = bytes(32 * 32)
+
+
+def build_grid(game_state: GameState, my_id: str, w: int, h: int):
+    """One pass over the board filling every per-turn structure at once:
+
+    - grid: bytearray of cell-class bits (BODY / OPP_NEXT / FOOD / MY_BODY)
+    - opp_heads / opp_body: opponent coordinates as int pairs
+    """
+    grid = bytearray(w * h)
+    opp_heads: typing.List[typing.Tuple[int, int]] = []
+    opp_body: typing.List[typing.Tuple[int, int]] = []
+    for s in game_state["board"]["snakes"]:
+        is_opp = s["id"] != my_id
+        body_bits = BODY if is_opp else BODY | MY_BODY
+        for seg in s["body"]:
+            sx, sy = seg["x"], seg["y"]
+            grid[sy * w + sx] |= body_bits
+            if is_opp:
+                opp_body.append((sx, sy))
+        if is_opp:
+            head = s["head"]
+            sx, sy = head["x"], head["y"]
+            opp_heads.append((sx, sy))
+            for dx, dy in _DXY:
+                nx, ny = sx + dx, sy + dy
+                if 0 <= nx < w and 0 <= ny < h:
+                    grid[ny * w + nx] |= OPP_NEXT
+    for f in game_state["board"]["food"]:
+        grid[f["y"] * w + f["x"]] |= FOOD
+    return grid, opp_heads, opp_body
+
+
+def flood_fill_size(sx: int, sy: int, grid: bytearray, w: int, h: int, limit: int = 200) -> int:
+    body = BODY
+    if not (0 <= sx < w and 0 <= sy < h) or grid[sy * w + sx] & body:
+        return 0
+    # Flat int-only kernel: the queue holds encoded cells, vertical neighbors
+    # are ±w and horizontal ones ±1 guarded by the x coordinate, so the loop
+    # allocates nothing per node.
+    size = w * h
+    # Dense visited map: one byte per cell beats a hash set for boards this small.
+    scratch = _SCRATCH
+    if size <= len(scratch.seen):
+        seen = scratch.seen
+        seen[:size] = _ZERO[:size]
+        q = scratch.q
+        q.clear()
+    else:
+        seen = bytearray(size)
+        q = deque()
+    start = sy * w + sx
+    seen[start] = 1
+    q.append(start)
+    pop = q.popleft
+    push = q.append
+    count = 0
+    while q and count < limit:
+        k = pop()
+        count += 1
+        x = k % w
+        n = k + w
+        if n < size and not seen[n] and not grid[n] & body:
+            seen[n] = 1; push(n)
+        n = k - w
+        if n >= 0 and not seen[n] and not grid[n] & body:
+            seen[n] = 1; push(n)
+        if x > 0:
+            n = k - 1
+            if not seen[n] and not grid[n] & body:
+                seen[n] = 1; push(n)
+        if x < w - 1:
+            n = k + 1
+            if not seen[n] and not grid[n] & body:
+                seen[n] = 1; push(n)
+    return count
+
+
+def bfs_distance_field(tx: int, ty: int, grid: bytearray, w: int, h: int, limit: int = 400) -> typing.List[int]:
+    """One BFS outward from (tx, ty) over free cells.
+
+    Returns a flat list where dist[k] is the true path distance from cell k
+    to the target, or -1 where the target is unreachable (or beyond the
+    expansion limit). Every candidate's distance is then an O(1) lookup
+    instead of its own search.
+    """
+    body = BODY
+    size = w * h
+    dist = [-1] * size
+    start = ty * w + tx
+    dist[start] = 0
+    q = _SCRATCH.q
+    q.clear()
+    q.append(start)
+    pop = q.popleft
+    push = q.append
+    count = 0
+    while q and count < limit:
+        k = pop()
+        count += 1
+        nd = dist[k] + 1
+        x = k % w
+        n = k + w
+        if n < size and dist[n] < 0 and not grid[n] & body:
+            dist[n] = nd; push(n)
+        n = k - w
+        if n >= 0 and dist[n] < 0 and not grid[n] & body:
+            dist[n] = nd; push(n)
+        if x > 0:
+            n = k - 1
+            if dist[n] < 0 and not grid[n] & body:
+                dist[n] = nd; push(n)
+        if x < w - 1:
+            n = k + 1
+            if dist[n] < 0 and not grid[n] & body:
+                dist[n] = nd; push(n)
+    return dist
+
+
+def nearest_food(hx: int, hy: int, foods: typing.List[Coord],
+                 opp_head_xy: typing.List[typing.Tuple[int, int]] = ()) -> typing.Optional[Coord]:
+    """Nearest food, preferring one we can reach no later than any opponent.
+
+    Plain loop instead of min(key=...): no closure allocation per call. Each
+    food's minimum opponent distance is computed at most once per turn here
+    (opponent heads don't move during candidate scoring), and the opponent
+    scan bails as soon as some opponent is strictly closer than we are.
+    """
+    best = None
+    best_d = 1 << 30
+    fallback = None
+    fallback_d = 1 << 30
+    for f in foods:
+        fx, fy = f["x"], f["y"]
+        d = abs(hx - fx) + abs(hy - fy)
+        if d < fallback_d:
+            fallback_d = d
+            fallback = f
+        if d < best_d:
+            contested = False
+            for ox, oy in opp_head_xy:
+                if abs(fx - ox) + abs(fy - oy) < d:
+                    contested = True
+                    break
+            if not contested:
+                best_d = d
+                best = f
+    # Every food contested: chase the nearest one anyway.
+    return best if best is not None else fallback
@@ -0,0 +1,274 @@
+# Welcome to
+# __________         __    __  .__                               __
+# \______   \_____ _/  |__/  |_|  |   ____   ______ ____ _____  |  | __ ____
+#  |    |  _/\__  \\   __\   __\  | _/ __ \ /  ___//    \\__  \ |  |/ // __ \
+#  |    |   \ / __ \|  |  |  | |  |_\  ___/ \___ \|   |  \/ __ \|    <\  ___/
+#  |________/(______/__|  |__| |____/\_____>______>___|__(______/__|__\\_____>
+#
+# Negamax search for 1v1 endgames
+# - Iterative-deepening negamax with alpha-beta pruning: sees the opponent's
+#   best reply instead of scoring a single ply with hand-tuned weights
+# - Zobrist-hashed transposition table reuses subtree scores and orders the
+#   remembered best child first, so deeper iterations cut early
+# - Model simplifications: snakes move alternately (Battlesnake is really
+#   simultaneous), health is ignored, and eaten food grows the eater by
+#   keeping its tail
+
+import random
+import time
+import typing
+
+from examples.engine import GameState, flood_fill_size
+
+MOVES = (("up", 0, 1), ("down", 0, -1), ("left", -1, 0), ("right", 1, 0))
+
+# Terminal scores dwarf any positional evaluation.
+WIN = 1_000_000
+
+# Bodies are lists of packed int cells (y * w + x), head first.
+Body = typing.List[int]
+
+# Zobrist tables per board size: one 64-bit key per (cell, piece) with pieces
+# {my body, opp body, food} plus a side-to-move key. Seeded deterministically
+# so replays hash identically.
+_ZOBRIST_CACHE: typing.Dict[int, tuple] = {}
+
+# Transposition table: key -> (depth, score, flag, best_cell) with flag
+# 0=exact, 1=lower bound, 2=upper bound. Cleared per turn; the payoff is
+# re-searching the same subtrees across deepening iterations.
+_TT: typing.Dict[int, typing.Tuple[int, int, int, int]] = {}
+
+
+def warm(width: int, height: int) -> None:
+    """Build the Zobrist table for this board size ahead of the first move.
+
+    Meant to be called from the /start handler, which has no timing
+    constraint — generating w*h*3 random 64-bit keys is the only noticeable
+    one-off cost in this module.
+    """
+    _zobrist(width * height)
+
+
+def _zobrist(size: int) -> tuple:
+    tbl = _ZOBRIST_CACHE.get(size)
+    if tbl is None:
+        rng = random.Random(0x5EED)
+        tbl = (
+            [rng.getrandbits(64) for _ in range(size)],  # my body
+            [rng.getrandbits(64) for _ in range(size)],  # opp body
+            [rng.getrandbits(64) for _ in range(size)],  # food
+            rng.getrandbits(64),                         # side to move
+        )
+        _ZOBRIST_CACHE[size] = tbl
+    return tbl
+
+
+def _hash_state(bodies: typing.List[Body], food: typing.Set[int], me: int, tbl: tuple) -> int:
+    key = 0
+    for k in bodies[0]:
+        key ^= tbl[0][k]
+    for k in bodies[1]:
+        key ^= tbl[1][k]
+    for k in food:
+        key ^= tbl[2][k]
+    if me == 1:
+        key ^= tbl[3]
+    return key
+
+
+def _evaluate(bodies: typing.List[Body], me: int, w: int, size: int) -> int:
+    """Positional score for snake `me`: reachable-space difference plus a
+    length bonus. Only called at the depth horizon. The 0/1 blocked mask is
+    fed straight to the shared flood kernel (its BODY bit is 1)."""
+    blocked = bytearray(size)
+    for body in bodies:
+        for k in body:
+            blocked[k] = 1
+    h = size // w
+    spaces = []
+    for body in bodies:
+        head = body[0]
+        blocked[head] = 0
+        spaces.append(flood_fill_size(head % w, head // w, blocked, w, h, limit=120))
+        blocked[head] = 1
+    opp = 1 - me
+    return (spaces[me] - spaces[opp]) + 8 * (len(bodies[me]) - len(bodies[opp]))
+
+
+def _candidate_cells(bodies: typing.List[Body], me: int, w: int, h: int, size: int) -> typing.List[int]:
+    """Legal destination cells for snake `me`, best-first.
+
+    Own and opponent tail cells are treated as free (they normally vacate).
+    Ordering prefers cells far from the opponent's head so alpha-beta cuts
+    early on the likely-best line.
+    """
+    blocked = bytearray(size)
+    for body in bodies:
+        for k in body:
+            blocked[k] = 1
+    for body in bodies:
+        blocked[body[-1]] = 0
+    head = bodies[me][0]
+    hx, hy = head % w, head // w
+    opp_head = bodies[1 - me][0]
+    ox, oy = opp_head % w, opp_head // w
+    cells = []
+    for _, dx, dy in MOVES:
+        nx, ny = hx + dx, hy + dy
+        if 0 <= nx < w and 0 <= ny < h:
+            k = ny * w + nx
+            if k == opp_head or not blocked[k]:
+                cells.append((abs(nx - ox) + abs(ny - oy), k))
+    cells.sort(reverse=True)
+    return [k for _, k in cells]
+
+
+def negamax(bodies: typing.List[Body], food: typing.Set[int], me: int,
+            depth: int, alpha: int, beta: int, w: int, h: int,
+            key: int, tbl: tuple) -> int:
+    """Score of the position for the side to move (`me`), searching `depth`
+    plies. One ply = one snake moving. `key` is the incremental Zobrist hash
+    of (bodies, food, side to move)."""
+    size = w * h
+    entry = _TT.get(key)
+    tt_cell = -1
+    if entry is not None:
+        e_depth, e_score, e_flag, tt_cell = entry
+        if e_depth >= depth:
+            if e_flag == 0:
+                return e_score
+            if e_flag == 1 and e_score >= beta:
+                return e_score
+            if e_flag == 2 and e_score <= alpha:
+                return e_score
+    if depth == 0:
+        return _evaluate(bodies, me, w, size)
+
+    opp = 1 - me
+    cells = _candidate_cells(bodies, me, w, h, size)
+    if not cells:
+        return -(WIN + depth)  # boxed in: losing sooner is worse
+    if tt_cell in cells:
+        cells.remove(tt_cell)
+        cells.insert(0, tt_cell)  # remembered best child first
+
+    alpha_orig = alpha
+    best = -(WIN * 2)
+    best_cell = cells[0]
+    my_tbl = tbl[me]
+    for k in cells:
+        if k == bodies[opp][0]:
+            # Head-to-head: the longer snake survives.
+            score = WIN if len(bodies[me]) > len(bodies[opp]) else -WIN
+        else:
+            saved = bodies[me]
+            ate = k in food
+            child_key = key ^ my_tbl[k] ^ tbl[3]
+            if ate:
+                bodies[me] = [k] + saved
+                food.discard(k)
+                child_key ^= tbl[2][k]
+            else:
+                bodies[me] = [k] + saved[:-1]
+                child_key ^= my_tbl[saved[-1]]
+            score = -negamax(bodies, food, opp, depth - 1, -beta, -alpha, w, h,
+                             child_key, tbl)
+            bodies[me] = saved
+            if ate:
+                food.add(k)
+        if score > best:
+            best = score
+            best_cell = k
+        if best > alpha:
+            alpha = best
+        if alpha >= beta:
+            break
+
+    if best <= alpha_orig:
+        flag = 2
+    elif best >= beta:
+        flag = 1
+    else:
+        flag = 0
+    _TT[key] = (depth, best, flag, best_cell)
+    return best
+
+
+def best_move(game_state: GameState, depth: int = 8,
+              budget: float = 0.05) -> typing.Optional[str]:
+    """Pick a move by iterative-deepening negamax. Deepens two plies at a
+    time until `depth` or the time `budget` (seconds) is spent; the last
+    completed iteration's move is returned. Returns None unless the board is
+    exactly 1v1 (the model only covers two snakes)."""
+    board = game_state["board"]
+    w, h = board["width"], board["height"]
+    you = game_state["you"]
+    opponents = [s for s in board["snakes"] if s["id"] != you["id"]]
+    if len(opponents) != 1:
+        return None
+
+    bodies = [
+        [seg["y"] * w + seg["x"] for seg in you["body"]],
+        [seg["y"] * w + seg["x"] for seg in opponents[0]["body"]],
+    ]
+    food = {f["y"] * w + f["x"] for f in board["food"]}
+
+    size = w * h
+    tbl = _zobrist(size)
+    root_key = _hash_state(bodies, food, 0, tbl)
+    _TT.clear()
+
+    deadline = time.monotonic() + budget
+    chosen = None
+    for d in range(2, depth + 1, 2):
+        move_name = _search_root(bodies, food, d, w, h, root_key, tbl)
+        if move_name is None:
+            break
+        chosen = move_name
+        if time.monotonic() >= deadline:
+            break
+    return chosen
+
+
+def _search_root(bodies: typing.List[Body], food: typing.Set[int], depth: int,
+                 w: int, h: int, root_key: int, tbl: tuple) -> typing.Optional[str]:
+    size = w * h
+    head = bodies[0][0]
+    hx, hy = head % w, head // w
+    # At most 4 cells: linear membership on the list is cheaper than hashing
+    # them into a set first.
+    legal = _candidate_cells(bodies, 0, w, h, size)
+    best_score = -(WIN * 2)
+    chosen = None
+    alpha, beta = -(WIN * 2), WIN * 2
+    for name, dx, dy in MOVES:
+        nx, ny = hx + dx, hy + dy
+        if not (0 <= nx < w and 0 <= ny < h):
+            continue
+        k = ny * w + nx
+        if k not in legal:
+            continue
+        if k == bodies[1][0]:
+            score = WIN if len(bodies[0]) > len(bodies[1]) else -WIN
+        else:
+            saved = bodies[0]
+            ate = k in food
+            child_key = root_key ^ tbl[0][k] ^ tbl[3]
+            if ate:
+                bodies[0] = [k] + saved
+                food.discard(k)
+                child_key ^= tbl[2][k]
+            else:
+                bodies[0] = [k] + saved[:-1]
+                child_key ^= tbl[0][saved[-1]]
+            score = -negamax(bodies, food, 1, depth - 1, -beta, -alpha, w, h,
+                             child_key, tbl)
+            bodies[0] = saved
+            if ate:
+                food.add(k)
+        if score > best_score:
+            best_score = score
+            chosen = name
+        if best_score > alpha:
+            alpha = best_score
+    return chosen
@@ -1,5 +1,5 @@
-import heapq
 import typing
+from collections import deque
 
 # Welcome to
 # __________         __    __  .__                               __
@@ -30,9 +30,39 @@ def info() -> typing.Dict:
     }
 
 
+# Direction constants, lifted to module scope so the hot loops don't rebuild
+# a list (or dict) of them on every node pop / every turn.
+_DIRS = ((0, 1, "up"), (0, -1, "down"), (-1, 0, "left"), (1, 0, "right"))
+_MOVE_MAP = {
+    (0, 1): "up",
+    (0, -1): "down",
+    (-1, 0): "left",
+    (1, 0): "right"
+}
+
+# Memo of search results for this game, keyed by the exact search inputs
+# (head cell, danger mask bytes, food tuple). Consecutive turns often repeat
+# a state (symmetric opponent moves, middleware replaying a turn), and a
+# repeat then costs one dict lookup instead of a full search.
+_path_cache: typing.Dict[tuple, list] = {}
+
+# The path we committed to last turn, tagged with the game it belongs to.
+# If the snake followed it, this turn's answer is just the tail of the same
+# path — no search at all — unless a danger moved onto the remaining cells
+# or the target food was eaten. The game id must match before the plan is
+# reused: the server plays several games at once and their move() calls
+# interleave, and a plan's packed cells are only meaningful on the board
+# they were computed for. The path is a deque, so following the plan
+# consumes one popleft per turn instead of re-slicing and re-copying a list.
+_plan: typing.Dict[str, typing.Any] = {"game_id": None, "path": deque()}
+
+
 # start is called when your Battlesnake begins a game
 def start(game_state: typing.Dict):
     print("GAME START")
+    _path_cache.clear()
+    _plan["game_id"] = game_state.get("game", {}).get("id")
+    _plan["path"].clear()
 
 
 # end is called when your Battlesnake finishes a game
@@ -43,73 +73,187 @@ def end(game_state: typing.Dict):
 # move is called on every turn and returns your next move
 # Valid moves are "up", "down", "left", or "right"
 # See https://docs.battlesnake.com/api/example-move for available data
-def dijkstra(board_width, board_height, start, dangers, food):
-    distances = {start: 0}
-    queue = [(0, start)]
-    came_from = {}
+def bfs(board_width, board_height, start, danger, food):
+    # Multi-source search: seed the frontier with every food cell at
+    # distance 0 and expand toward the head. With many food tiles this
+    # prunes earlier than searching from the head, the goal test is a single
+    # equality check, and the came_from chain from the head already walks in
+    # travel order, so no reverse() is needed.
+    #
+    # Cells are packed ints (y * width + x) end to end — `start`, the `food`
+    # list and the returned path all use the encoding — and `danger` is a
+    # flat bytearray mask, so the search allocates no coordinate tuples at
+    # all: neighbors are current ± step, occupancy is one indexed byte load.
+    if not food:
+        return []
+    goal = start
+    size = board_width * board_height
+
+    # Every step costs 1, so this is plain BFS: a FIFO deque visits cells in
+    # exact distance order with ~constant-time append/popleft, and no
+    # priority machinery of any kind is needed. A flat byte per cell marks
+    # visited; came_from holds predecessor ints with -1 for "none".
+    seen = bytearray(size)
+    came_from = [-1] * size
+    # Bulk-seed the frontier in one constructor call instead of k appends.
+    queue = deque(food)
+    for k in food:
+        seen[k] = 1
+
+    # Neighbor steps in packed form: ±width is up/down, ±1 is left/right
+    # (guarded against row wrap by the x coordinate). Built per call because
+    # the vertical step depends on the board width.
+    steps = ((board_width, 0), (-board_width, 0), (-1, -1), (1, 1))
+
+    # Bind the queue's bound methods once: LOAD_FAST per call in the loop
+    # instead of a LOAD_GLOBAL-style attribute lookup on every push/pop.
+    pop = queue.popleft
+    push = queue.append
 
     while queue:
-        current_dist, current = heapq.heappop(queue)
-
-        if current in food:
-            path = []
-            while current != start:
-                path.append(current)
-                current = came_from[current]
-            path.reverse()
-            return path
-
-        for dx, dy, direction in [(0, 1, "up"), (0, -1, "down"),
-                                  (-1, 0, "left"), (1, 0, "right")]:
-            nx, ny = current[0] + dx, current[1] + dy
-            neighbor = (nx, ny)
-
-            if (0 <= nx < board_width and 0 <= ny < board_height
-                    and neighbor not in dangers):
-                new_dist = current_dist + 1
-                if neighbor not in distances or new_dist < distances[neighbor]:
-                    distances[neighbor] = new_dist
-                    heapq.heappush(queue, (new_dist, neighbor))
-                    came_from[neighbor] = current
+        current = pop()
+
+        cx = current % board_width
+        for step, dx in steps:
+            nx = cx + dx
+            if nx < 0 or nx >= board_width:
+                continue  # row wrap on a horizontal step
+            neighbor = current + step
+            if neighbor < 0 or neighbor >= size:
+                continue  # off the top or bottom edge
+            if neighbor == goal:
+                # Test the goal at generation instead of at pop: the first
+                # relaxation to reach the head is already optimal, which
+                # skips every push and pop between the goal being generated
+                # and it surfacing from the queue. (The head cell sits in
+                # the danger mask — it is a body segment — so it is matched
+                # before the danger test.)
+                path = []
+                node = current
+                while node >= 0:
+                    path.append(node)
+                    node = came_from[node]
+                return path
+            if not danger[neighbor] and not seen[neighbor]:
+                seen[neighbor] = 1
+                came_from[neighbor] = current
+                push(neighbor)
 
     return []
 
 
+def _flood_area(start, danger, board_width, board_height):
+    # Count free cells reachable from `start` (a packed cell) over the danger
+    # mask — how much room a move leaves us when no path to food exists.
+    size = board_width * board_height
+    seen = bytearray(size)
+    seen[start] = 1
+    queue = deque((start,))
+    pop = queue.popleft
+    push = queue.append
+    area = 0
+    while queue:
+        k = pop()
+        area += 1
+        x = k % board_width
+        y = k // board_width
+        for dx, dy, direction in _DIRS:
+            nx, ny = x + dx, y + dy
+            if (nx | ny) >= 0 and nx < board_width and ny < board_height:
+                n = ny * board_width + nx
+                if not seen[n] and not danger[n]:
+                    seen[n] = 1
+                    push(n)
+    return area
+
+
 def move(game_state: typing.Dict) -> typing.Dict:
+    # Battlesnake sends coordinates as JSON numbers and json.loads already
+    # parses them as Python ints — no defensive int() casts needed.
     my_head = game_state["you"]["body"][0]
-    head_pos = (int(my_head["x"]), int(my_head["y"]))
+    hx, hy = my_head["x"], my_head["y"]
 
-    dangers = set()
-    for snake in game_state["board"]["snakes"]:
+    board = game_state["board"]
+    board_width = board["width"]
+    board_height = board["height"]
+    head = hy * board_width + hx
+
+    # Flat occupancy mask: one byte per cell, indexed y * width + x. Built
+    # in one tight scatter pass — each segment costs two dict subscripts and
+    # one indexed byte store, nothing else in the loop body.
+    danger = bytearray(board_width * board_height)
+    for snake in board["snakes"]:
         for segment in snake["body"]:
-            dangers.add((int(segment["x"]), int(segment["y"])))
+            danger[segment["y"] * board_width + segment["x"]] = 1
+
+    # Food as packed cells too: the whole pipeline — search, plan, caches —
+    # shares one encoding, so nothing converts back and forth.
+    food = [f["y"] * board_width + f["x"] for f in board["food"]]
 
-    food = [(int(f["x"]), int(f["y"])) for f in game_state["board"]["food"]]
-    board_width = game_state["board"]["width"]
-    board_height = game_state["board"]["height"]
+    game_id = game_state.get("game", {}).get("id")
+    plan = _plan["path"]
 
-    path = dijkstra(board_width, board_height, head_pos, dangers, food)
+    # Food one step away: nothing to search (or plan) — grab it. Food cells
+    # are never occupied, so only bounds need checking.
+    for dx, dy, move_dir in _DIRS:
+        nx, ny = hx + dx, hy + dy
+        if (0 <= nx < board_width and 0 <= ny < board_height
+                and ny * board_width + nx in food):
+            if game_id == _plan["game_id"]:
+                plan.clear()
+            return {"move": move_dir}
+
+    # Reuse last turn's plan if we are on it: it must belong to this game,
+    # the head must sit where the plan predicted, the rest of the path must
+    # still be danger-free, and the food at its end must still be there.
+    path = None
+    if game_id == _plan["game_id"] and plan and plan[0] == head:
+        plan.popleft()
+        if (plan and plan[-1] in food
+                and not any(danger[k] for k in plan)):
+            path = plan  # consumed in place: no slicing, no copies
+
+    if path is None:
+        cache_key = (head, bytes(danger), tuple(food))
+        path = _path_cache.get(cache_key)
+        if path is None:
+            if len(_path_cache) >= 4096:
+                _path_cache.clear()
+            path = bfs(board_width, board_height, head, danger, food)
+            _path_cache[cache_key] = path
+        _plan["game_id"] = game_id
+        plan.clear()
+        plan.extend(path)
 
     if path:
-        next_pos = path[0]
-        dx, dy = next_pos[0] - head_pos[0], next_pos[1] - head_pos[1]
-        move_map = {
-            (0, 1): "up",
-            (0, -1): "down",
-            (-1, 0): "left",
-            (1, 0): "right"
-        }
-        return {"move": move_map[(dx, dy)]}
-
-    safe_moves = []
-    for move_dir, (dx, dy) in [("up", (0, 1)), ("down", (0, -1)),
-                               ("left", (-1, 0)), ("right", (1, 0))]:
-        nx, ny = head_pos[0] + dx, head_pos[1] + dy
+        next_cell = path[0]
+        dx = next_cell % board_width - hx
+        dy = next_cell // board_width - hy
+        return {"move": _MOVE_MAP[(dx, dy)]}
+
+    # No path to food: don't pick an arbitrary safe direction — that walks
+    # into dead-end pockets. Flood fill from each safe neighbor and take the
+    # one with the most reachable room, ties broken toward the nearest food.
+    # Decode the food coordinates once up front instead of unpacking every
+    # food cell again for each candidate.
+    food_xy = [(k % board_width, k // board_width) for k in food]
+    best_dir = None
+    best_key = None
+    for dx, dy, move_dir in _DIRS:
+        nx, ny = hx + dx, hy + dy
         if (0 <= nx < board_width and 0 <= ny < board_height
-                and (nx, ny) not in dangers):
-            safe_moves.append(move_dir)
+                and not danger[ny * board_width + nx]):
+            area = _flood_area(ny * board_width + nx, danger,
+                               board_width, board_height)
+            food_dist = min((abs(nx - fx) + abs(ny - fy)
+                             for fx, fy in food_xy),
+                            default=0)
+            key = (area, -food_dist)
+            if best_key is None or key > best_key:
+                best_key = key
+                best_dir = move_dir
 
-    return {"move": safe_moves[0] if safe_moves else "up"}
+    return {"move": best_dir if best_dir else "up"}
 
 
 # Start server when `python main.py` is run